@@ -0,0 +1,347 @@
+"""Connexa MCP server: tool/resource registration and Connexa-level resources."""
+
+import asyncio
+import logging
+import sys
+from contextlib import asynccontextmanager, suppress
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import FastMCP
+
+import mcp_ovpn_res
+import user_tools
+import selected_object
+from selected_object import _get_swagger_content
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def _lifespan(_server):
+    # Warm the group-name cache in the background so the first
+    # users-with-group-info call does not pay the full fan-out.
+    refresh_task = user_tools.start_group_cache_refresh()
+    try:
+        yield
+    finally:
+        refresh_task.cancel()
+        # Let the warmer unwind before the pooled client goes away, so
+        # no in-flight refresh request has its client closed under it.
+        with suppress(asyncio.CancelledError):
+            await refresh_task
+        # Release the pooled HTTP client's connections on shutdown.
+        await user_tools.aclose_shared_client()
+
+
+mcp = FastMCP("connexa-openvpn", lifespan=_lifespan)
+
+# Shared JSON-Schema fragments.  The same "optional string" descriptor
+# appears in most creation schemas; building it once and referencing it
+# keeps the import-time dict count (and resident memory) down.  The
+# fragments end up nested in payloads the framework JSON-serializes, so
+# they must be plain dicts/lists (no proxies); read-only by convention.
+_STR = {"type": "string"}
+_NULL = {"type": "null"}
+_OPT_STR = {"anyOf": [_STR, _NULL], "default": None}
+
+# Creation schemas for the object types agents can create directly.
+# Hoisted to module scope (and frozen) so each request is a lookup rather
+# than rebuilding the nested literals.
+_HARDCODED_SCHEMAS = MappingProxyType(
+    {
+        "Network": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string"},
+                "description": _OPT_STR,
+                "internetAccess": {
+                    "type": "string",
+                    "enum": ["SPLIT_TUNNEL_ON", "SPLIT_TUNNEL_OFF", "RESTRICTED_INTERNET"],
+                    "default": "SPLIT_TUNNEL_ON",
+                },
+                "egress": {"type": "boolean", "default": False},
+            },
+        },
+        "Connector": {
+            "type": "object",
+            "required": ["name", "vpnRegionId"],
+            "properties": {
+                "name": {"type": "string"},
+                "description": _OPT_STR,
+                "vpnRegionId": {"type": "string"},
+            },
+        },
+        "Host": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string"},
+                "description": _OPT_STR,
+                "domain": _OPT_STR,
+                "internetAccess": {"type": "string", "default": "SPLIT_TUNNEL_ON"},
+            },
+        },
+        "User": {
+            "type": "object",
+            "required": ["username", "email"],
+            "properties": {
+                "username": {"type": "string"},
+                "email": {"type": "string"},
+                "firstName": _OPT_STR,
+                "lastName": _OPT_STR,
+                "groupId": _OPT_STR,
+                "role": {"type": "string", "enum": ["ADMIN", "MEMBER", "OWNER"], "default": "MEMBER"},
+            },
+        },
+        "UserGroup": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string"},
+                "connectAuth": {"type": "string", "enum": ["AUTH", "NO_AUTH", "AUTO"], "default": "NO_AUTH"},
+                "internetAccess": {"type": "string", "default": "SPLIT_TUNNEL_ON"},
+                "maxDevice": {"type": "integer", "default": 3},
+            },
+        },
+        "DnsRecord": {
+            "type": "object",
+            "required": ["domain"],
+            "properties": {
+                "domain": {"type": "string"},
+                "description": _OPT_STR,
+                "ipV4Addresses": {"type": "array", "items": {"type": "string"}, "default": []},
+                "ipV6Addresses": {"type": "array", "items": {"type": "string"}, "default": []},
+            },
+        },
+    }
+)
+
+# Maps object types to the swagger component used when no hardcoded
+# schema exists (kept in sync with swagger.json).
+_SCHEMA_NAME_MAP = MappingProxyType(
+    {
+        "Network": "NetworkCreateRequest",
+        "Connector": "NetworkConnectorRequest",
+        "Host": "HostRequest",
+        "User": "UserRequest",
+        "UserGroup": "UserGroupRequest",
+        "DnsRecord": "DnsRecordRequest",
+    }
+)
+
+
+# Computed once: every miss/listing path references this instead of
+# re-iterating the schema keys.  The key set is static, so the error
+# message only needs the offending type filled in.
+_AVAILABLE_TYPES = tuple(_HARDCODED_SCHEMAS)
+_NO_SCHEMA_ERR_TMPL = (
+    f"No hardcoded creation schema found for object_type: %r. Available: {_AVAILABLE_TYPES}"
+)
+
+# Full response payloads per hardcoded type, prebuilt once so a hit is a
+# single lookup.  These cross the wire and the framework JSON-serializes
+# the handler's return value, so they must stay plain dicts (a
+# mappingproxy is not JSON serializable); consumers treat them read-only.
+_RESPONSES = {
+    ot: {"object_type": ot, "schema_name": f"Create{ot}Args", "schema": schema}
+    for ot, schema in _HARDCODED_SCHEMAS.items()
+}
+
+# The object_type=None listing never changes; both the parameter-less
+# resource and the None branch hand out this prebuilt payload.
+_NONE_OBJECT_TYPE_RESPONSE = {
+    "description": (
+        "Creation schemas for Connexa objects. Request "
+        "connexa://creation-schema/{object_type} for a specific one."
+    ),
+    "available_types": _AVAILABLE_TYPES,
+}
+
+
+# Direct reference to swagger's components.schemas, memoized against the
+# parsed swagger object itself so each lookup is a single dict get.  The
+# fragments are handed out by reference; consumers treat them read-only.
+_swagger_schemas_cache: Optional[tuple] = None
+
+
+def _get_swagger_schemas() -> Optional[Dict[str, Any]]:
+    global _swagger_schemas_cache
+    swagger_data = _get_swagger_content()
+    if _swagger_schemas_cache is not None and _swagger_schemas_cache[0] is swagger_data:
+        return _swagger_schemas_cache[1]
+    schemas = None
+    if swagger_data and "components" in swagger_data and "schemas" in swagger_data["components"]:
+        schemas = swagger_data["components"]["schemas"]
+    _swagger_schemas_cache = (swagger_data, schemas)
+    return schemas
+
+
+async def get_creation_schema_resource(object_type: Optional[str] = None) -> Dict[str, Any]:
+    """Return the creation schema for ``object_type`` (or list the types)."""
+    if object_type is None:
+        logger.debug("get_creation_schema_resource: listing available types")
+        return _NONE_OBJECT_TYPE_RESPONSE
+    if isinstance(object_type, str):
+        # The schema keys are interned source literals; interning the
+        # incoming key lets repeated lookups hit the pointer-equality
+        # fast path instead of re-comparing characters.
+        object_type = sys.intern(object_type)
+    response = _RESPONSES.get(object_type)
+    if response is not None:
+        logger.debug("get_creation_schema_resource: returning hardcoded schema for %s", object_type)
+        return response
+    # Unknown types bail out before the swagger content is even loaded.
+    target_schema_name = _SCHEMA_NAME_MAP.get(object_type)
+    if target_schema_name is None:
+        logger.debug("get_creation_schema_resource: no schema for %s", object_type)
+        return {
+            "error": _NO_SCHEMA_ERR_TMPL % object_type,
+            "available_types": _AVAILABLE_TYPES,
+        }
+    schemas = _get_swagger_schemas()
+    if schemas is not None:
+        schema = schemas.get(target_schema_name)
+        if schema is not None:
+            return {
+                "object_type": object_type,
+                "schema_name": target_schema_name,
+                "schema": schema,
+            }
+    logger.debug("get_creation_schema_resource: swagger has no %s", target_schema_name)
+    return {
+        "error": _NO_SCHEMA_ERR_TMPL % object_type,
+        "available_types": _AVAILABLE_TYPES,
+    }
+
+
+async def get_creation_schema_resource_base() -> Dict[str, Any]:
+    """Parameter-less creation-schema resource (lists the available types)."""
+    return _NONE_OBJECT_TYPE_RESPONSE
+
+
+# Static part of the overview payload; only the registered tool/resource
+# listings vary at runtime.  Frozen (proxy + tuples) so consumers can
+# alias it across tasks without defensive copies.
+_CONNEXA_OVERVIEW_STATIC = MappingProxyType({
+    "Network": {
+        "description": "A virtual network (WPC) grouping routes, services and connectors.",
+        "relations": ("Connector", "Route", "IPService"),
+    },
+    "Connector": {
+        "description": "Attaches a network or host to a VPN region.",
+        "relations": ("Network", "Host", "Region"),
+    },
+    "Route": {
+        "description": "A subnet or domain routed through a network.",
+        "relations": ("Network",),
+    },
+    "IPService": {
+        "description": "A service published on a network.",
+        "relations": ("Network",),
+    },
+    "Host": {
+        "description": "A single machine exposed through its own connectors.",
+        "relations": ("Connector",),
+    },
+    "User": {
+        "description": "A user account able to connect devices.",
+        "relations": ("UserGroup", "Device"),
+    },
+    "UserGroup": {
+        "description": "Connect policies shared by a set of users.",
+        "relations": ("User",),
+    },
+    "Device": {
+        "description": "A user's enrolled device.",
+        "relations": ("User",),
+    },
+    "DnsRecord": {
+        "description": "A custom DNS record resolved inside the WPC.",
+        "relations": (),
+    },
+    "Region": {
+        "description": "A point of presence connectors can attach to.",
+        "relations": ("Connector",),
+    },
+    "AccessGroup": {
+        "description": "Source/destination access control between entities.",
+        "relations": ("Network", "Host", "UserGroup"),
+    },
+    "Profile": {
+        "description": "An OpenVPN client profile for a device or connector.",
+        "relations": ("Device", "Connector"),
+    },
+    "Session": {
+        "description": "An active VPN session.",
+        "relations": ("User", "Device"),
+    },
+})
+
+
+# Plain-dict view for the wire: the frozen master above is what the
+# module aliases internally, but the serialized payload must not
+# contain a mappingproxy.  A shallow copy suffices; the per-type dicts
+# and relation tuples are serializable as-is.
+_CONNEXA_OVERVIEW_PLAIN = dict(_CONNEXA_OVERVIEW_STATIC)
+
+
+# Derived tool/resource listings change only when something registers;
+# the registry sizes are a cheap invariant to detect that.
+_overview_cache: Dict[str, Any] = {"version": None, "tools": [], "resources": []}
+
+
+async def get_connexa_overview_resource() -> Dict[str, Any]:
+    """Return an overview of Connexa objects plus the registered tools/resources."""
+    logger.debug("get_connexa_overview_resource: building overview")
+    try:
+        tools = mcp._tool_manager.list_tools()
+        resources = mcp._resource_manager.list_resources()
+        version = (len(tools), len(resources))
+        if _overview_cache["version"] != version:
+            _overview_cache["tools"] = [tool.name for tool in tools]
+            _overview_cache["resources"] = [str(resource.uri) for resource in resources]
+            _overview_cache["version"] = version
+        tool_names = _overview_cache["tools"]
+        resource_uris = _overview_cache["resources"]
+        return {
+            "registered_tools": tool_names,
+            "registered_resources": resource_uris,
+            "connexa_objects_overview": _CONNEXA_OVERVIEW_PLAIN,
+        }
+    except AttributeError as e:
+        # The private _tool_manager/_resource_manager accessors are the
+        # only fragile part here; anything else should propagate to the
+        # framework's structured error handling.
+        logger.debug("get_connexa_overview_resource: registry access failed: %s", e)
+        return {"error": f"An error occurred while building the overview: {e}"}
+
+
+# Resource registration ------------------------------------------------------
+
+mcp.resource("connexa://overview")(get_connexa_overview_resource)
+mcp.resource("connexa://creation-schema")(get_creation_schema_resource_base)
+mcp.resource("connexa://creation-schema/{object_type}")(get_creation_schema_resource)
+mcp.resource("ovpn://api/commands")(mcp_ovpn_res.get_api_commands_resource)
+mcp.resource("ovpn://api/schema")(mcp_ovpn_res.get_schema_json_resource)
+mcp.resource("ovpn://api/overview")(mcp_ovpn_res.get_api_overview_resource)
+mcp.resource("ovpn://api/etags")(mcp_ovpn_res.get_api_etags_resource)
+mcp.resource("ovpn://user-groups")(mcp_ovpn_res.get_user_groups_resource)
+mcp.resource("ovpn://users/with-group-info")(mcp_ovpn_res.get_users_with_group_info_resource)
+mcp.resource("ovpn://regions")(mcp_ovpn_res.get_regions_resource)
+mcp.resource("ovpn://selection/current")(mcp_ovpn_res.get_current_selection_data)
+
+# Tool registration ----------------------------------------------------------
+
+mcp.tool()(selected_object.select_object_tool)
+mcp.tool()(selected_object.act_on_selected_object)
+mcp.tool()(selected_object.complete_update_selected)
+
+
+def main() -> None:
+    mcp.run()
+
+
+if __name__ == "__main__":
+    main()
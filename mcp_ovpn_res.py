@@ -0,0 +1,408 @@
+"""MCP resource handlers for the CloudConnexa / OpenVPN Cloud API.
+
+Exposes the local API description files (api.json, schema.json) and a
+handful of live API views (user groups, users with group info, regions,
+the current selection) as MCP resources.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+from pathlib import Path
+from types import MappingProxyType
+
+import user_tools
+from selected_object import CURRENT_SELECTED_OBJECT
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+logger = logging.getLogger("connexa.mcp_ovpn_res")
+
+SERVER_DIR = Path(__file__).resolve().parent
+API_JSON_PATH = SERVER_DIR / "api.json"
+SCHEMA_JSON_PATH = SERVER_DIR / "schema.json"
+
+# Parsed-file cache keyed by (mtime_ns, size) so repeat requests are a
+# dict lookup and an edited file is picked up automatically.  Per-file
+# locks keep concurrent cold starts down to a single read+parse each
+# (double-checked pattern).
+_FILE_CACHE = {}
+_FILE_LOCKS = {API_JSON_PATH: asyncio.Lock(), SCHEMA_JSON_PATH: asyncio.Lock()}
+
+
+# Above this size, map the file instead of copying it into a bytes
+# object before parsing; below it, a plain read is cheaper than the
+# mmap setup/teardown.
+_MMAP_THRESHOLD = 1 << 20
+
+# Above this size, even orjson can stall the loop for tens of
+# milliseconds, so the parse runs in a single-worker process pool;
+# below it the pickle IPC would cost more than it saves.
+_PROCESS_PARSE_THRESHOLD = 4 << 20
+_JSON_POOL = None
+
+
+def _get_json_pool():
+    global _JSON_POOL
+    if _JSON_POOL is None:
+        _JSON_POOL = ProcessPoolExecutor(max_workers=1)
+    return _JSON_POOL
+
+
+def _read_file_sync(path):
+    # orjson parses bytes directly, skipping the text decode and running
+    # several times faster than the stdlib on multi-MB schema files.
+    # read_bytes() issues one pre-sized read; json.loads accepts the raw
+    # bytes on the fallback path too.
+    if orjson is not None:
+        if path.stat().st_size >= _MMAP_THRESHOLD:
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return orjson.loads(memoryview(mapped))
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
+
+
+def _err(msg, /, **extra):
+    """Build the standard error envelope shared by every resource."""
+    envelope = {"error": msg}
+    if extra:
+        envelope.update(extra)
+    return envelope
+
+
+def _dumps_text(obj):
+    """Serialize once, up front, so the framework ships text as-is."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+# Serialized form of each parsed file, keyed like _FILE_CACHE so an
+# edited file re-serializes along with the re-parse.
+_SERIALIZED_CACHE = {}
+
+# Content hashes of the serialized payloads, same keying.  blake2b is
+# the fastest stdlib hash at this digest size.
+_ETAG_CACHE = {}
+
+
+def _etag(text):
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+async def _load_json_cached(path):
+    st = path.stat()
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    cached = _FILE_CACHE.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    async with _FILE_LOCKS[path]:
+        st = path.stat()
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        cached = _FILE_CACHE.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        # Cold path only: reading a small warm-cache file takes well
+        # under the cost of a thread-pool dispatch (contextvars copy,
+        # executor submit, future wakeup), so do it inline.  Truly large
+        # files parse on another core to keep the loop responsive.
+        if st.st_size >= _PROCESS_PARSE_THRESHOLD:
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(_get_json_pool(), _read_file_sync, path)
+        else:
+            data = _read_file_sync(path)
+        _FILE_CACHE[path] = (fingerprint, data)
+        return data
+
+
+# Both files are static at runtime, so parse them once at import: the
+# first request then hits the cache like every later one.  The
+# fingerprint keyed entries still pick up edits in dev.
+for _path in (API_JSON_PATH, SCHEMA_JSON_PATH):
+    try:
+        _st = _path.stat()
+        _FILE_CACHE[_path] = ((_st.st_mtime_ns, _st.st_size), _read_file_sync(_path))
+    except (OSError, ValueError) as _e:
+        logger.warning("Could not prewarm %s: %s", _path, _e)
+del _path
+
+
+async def _load_json_text(path):
+    """Return the cached pre-serialized JSON text for ``path``."""
+    data = await _load_json_cached(path)
+    fingerprint = _FILE_CACHE[path][0]
+    cached = _SERIALIZED_CACHE.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    text = _dumps_text(data)
+    _SERIALIZED_CACHE[path] = (fingerprint, text)
+    return text
+
+
+async def _load_json_etag(path):
+    """Return the etag of the cached serialized form of ``path``."""
+    text = await _load_json_text(path)
+    fingerprint = _FILE_CACHE[path][0]
+    cached = _ETAG_CACHE.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    tag = _etag(text)
+    _ETAG_CACHE[path] = (fingerprint, tag)
+    return tag
+
+
+async def get_api_commands_resource():
+    """Return the contents of api.json (the API command listing)."""
+    logger.debug("get_api_commands_resource: reading %s", API_JSON_PATH)
+    try:
+        # Pre-serialized text: the framework forwards it without walking
+        # the dict again on every request.
+        return await _load_json_text(API_JSON_PATH)
+    except (OSError, ValueError) as e:
+        logger.exception("get_api_commands_resource: failed to read api.json")
+        return _err(f"Failed to read api.json: {e}")
+
+
+async def get_schema_json_resource():
+    """Return the contents of schema.json (request/response schemas)."""
+    logger.debug("get_schema_json_resource: reading %s", SCHEMA_JSON_PATH)
+    try:
+        return await _load_json_text(SCHEMA_JSON_PATH)
+    except (OSError, ValueError) as e:
+        logger.exception("get_schema_json_resource: failed to read schema.json")
+        return _err(f"Failed to read schema.json: {e}")
+
+
+_STREAM_CHUNK = 64 * 1024
+
+
+async def iter_schema_json_chunks(chunk_size=_STREAM_CHUNK):
+    """Yield the cached serialized schema.json in fixed-size slices.
+
+    FastMCP resources return whole payloads, so the registered handler
+    keeps handing out the cached text; this generator exists for
+    transports that can stream, slicing one shared immutable buffer via
+    memoryview so no per-consumer copy of the full payload is made.
+    """
+    text = await _load_json_text(SCHEMA_JSON_PATH)
+    buffer = memoryview(text.encode())
+    for offset in range(0, len(buffer), chunk_size):
+        yield bytes(buffer[offset : offset + chunk_size])
+
+
+# Purely static payload: built once at import instead of re-allocating
+# dozens of dicts/lists per request, and frozen against caller mutation.
+_API_OVERVIEW = MappingProxyType({
+    "api": "CloudConnexa",
+    "base_path": "/api/v1",
+    "description": (
+        "REST API for managing CloudConnexa (OpenVPN Cloud) networks, "
+        "connectors, hosts, users, user groups and DNS records."
+    ),
+    "authentication": {
+        "type": "oauth2",
+        "token_url": "/api/v1/oauth/token",
+        "credentials": ["CONNEXA_CLIENT_ID", "CONNEXA_CLIENT_SECRET"],
+    },
+    "areas": {
+        "networks": {
+            "path": "/api/v1/networks",
+            "description": "Virtual networks, their routes and IP services.",
+            "operations": ["list", "get", "create", "update", "delete"],
+        },
+        "connectors": {
+            "path": "/api/v1/networks/{networkId}/connectors",
+            "description": "Connectors attaching a network to a region.",
+            "operations": ["list", "get", "create", "update", "delete"],
+        },
+        "hosts": {
+            "path": "/api/v1/hosts",
+            "description": "Hosts and their connectors.",
+            "operations": ["list", "get", "create", "update", "delete"],
+        },
+        "users": {
+            "path": "/api/v1/users",
+            "description": "User accounts and their device allowances.",
+            "operations": ["list", "get", "create", "update", "delete"],
+        },
+        "user_groups": {
+            "path": "/api/v1/user-groups",
+            "description": "Groups controlling user connect policies.",
+            "operations": ["list", "get", "create", "update", "delete"],
+        },
+        "dns_records": {
+            "path": "/api/v1/dns-records",
+            "description": "Custom DNS records resolved inside the WPC.",
+            "operations": ["list", "get", "create", "update", "delete"],
+        },
+        "regions": {
+            "path": "/api/v1/regions",
+            "description": "Available points of presence.",
+            "operations": ["list"],
+        },
+    },
+    "resources": {
+        "api_commands": "ovpn://api/commands",
+        "schema_json": "ovpn://api/schema",
+        "user_groups": "ovpn://user-groups",
+        "users_with_group_info": "ovpn://users/with-group-info",
+        "regions": "ovpn://regions",
+        "current_selection": "ovpn://selection/current",
+        "etags": "ovpn://api/etags",
+    },
+    "notes": [
+        "Pagination uses page/size query parameters; responses carry "
+        "content, totalElements and totalPages fields.",
+        "All write operations require the selected parent object where "
+        "applicable (e.g. connectors require a selected network).",
+    ],
+})
+
+
+# Serialized once at import; the overview never changes at runtime.
+# (Shallow copy: the proxy itself is not JSON-serializable.)
+_API_OVERVIEW_JSON = _dumps_text(dict(_API_OVERVIEW))
+
+
+async def get_api_overview_resource():
+    """Return a high-level overview of the CloudConnexa API surface."""
+    logger.debug("get_api_overview_resource: returning overview")
+    return _API_OVERVIEW_JSON
+
+
+# MCP has no response-header channel, so the 304 dance is approximated
+# with a tiny resource: clients poll the etags and only re-fetch a
+# payload whose hash moved.
+_API_OVERVIEW_ETAG = _etag(_API_OVERVIEW_JSON)
+
+
+async def get_api_etags_resource():
+    """Return content hashes of the static payloads for client caching."""
+    try:
+        return {
+            "overview": _API_OVERVIEW_ETAG,
+            "api_commands": await _load_json_etag(API_JSON_PATH),
+            "schema_json": await _load_json_etag(SCHEMA_JSON_PATH),
+        }
+    except (OSError, ValueError) as e:
+        logger.exception("get_api_etags_resource: failed to read payload files")
+        return _err(f"Failed to compute etags: {e}")
+
+
+async def get_user_groups_resource():
+    """Return all user groups, transparently walking the API's pages."""
+    logger.debug("get_user_groups_resource: fetching user groups")
+    try:
+        groups = [group async for group in user_tools.iter_user_groups(size=1000)]
+        logger.debug("get_user_groups_resource: got %d groups", len(groups))
+        return {"content": groups, "totalElements": len(groups)}
+    except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+        logger.exception("get_user_groups_resource: failed to fetch user groups")
+        return _err(f"Failed to fetch user groups: {e}")
+
+
+# User record keys, interned once so the hot extraction loop hits the
+# pointer-equality fast path instead of re-hashing each literal.
+# (operator.itemgetter would bundle the lookups but raises KeyError on
+# the partial records this API is allowed to return.)
+_F_ID, _F_FIRST, _F_LAST, _F_EMAIL, _F_GROUP = map(
+    sys.intern, ("id", "firstName", "lastName", "email", "groupId")
+)
+
+
+async def get_users_with_group_info_resource():
+    """Return users enriched with the name of the group they belong to."""
+    logger.debug("get_users_with_group_info_resource: fetching users")
+    try:
+        users_data = await user_tools.get_users_async(page=0, size=1000)
+        if not isinstance(users_data, dict):
+            return _err(f"Unexpected users response: {users_data!r}")
+        if "error" in users_data:
+            # get_users_async reports transport failures as an error
+            # dict; do not dress one up as an empty user list.
+            return _err(f"Failed to fetch users with group info: {users_data['error']}")
+        content = list(users_data.get("content", []))
+
+        # Larger tenants spill past one page even at the server max page
+        # size; fetch the remainder concurrently rather than serially.
+        total_pages = users_data.get("totalPages") or 1
+        if total_pages > 1:
+            extra_pages = await asyncio.gather(
+                *(user_tools.get_users_async(page=p, size=1000) for p in range(1, total_pages))
+            )
+            for page_data in extra_pages:
+                if not isinstance(page_data, dict) or "error" in page_data:
+                    # A dropped page would silently truncate the tenant
+                    # while "total" still reports every user; fail the
+                    # whole resource instead.
+                    detail = page_data.get("error") if isinstance(page_data, dict) else repr(page_data)
+                    return _err(f"Failed to fetch users with group info: {detail}")
+                content.extend(page_data.get("content", []))
+
+        # Resolve every distinct group through the bulk listing path:
+        # at most one extra API call instead of one GET per group, and
+        # ids the listing cannot cover degrade to "N/A".
+        unique_ids = {u.get(_F_GROUP) for u in content if isinstance(u, dict) and u.get(_F_GROUP)}
+        group_names = await user_tools.resolve_group_names(unique_ids) if unique_ids else {}
+
+        # Group names are fully resolved at this point, so assembly is a
+        # single comprehension: LIST_APPEND in the interpreter instead of
+        # a method lookup + call per user.
+        processed_users = [
+            {
+                "id": u.get(_F_ID),
+                "name": (u.get(_F_FIRST, "") + " " + u.get(_F_LAST, "")).strip(),
+                "email": u.get(_F_EMAIL),
+                "group_id": u.get(_F_GROUP),
+                "group_name": group_names.get(u.get(_F_GROUP), "N/A"),
+            }
+            for u in content
+            if isinstance(u, dict)
+        ]
+        logger.debug("get_users_with_group_info_resource: processed %d users", len(processed_users))
+        return {
+            "users": processed_users,
+            "total": users_data.get("totalElements", len(processed_users)),
+        }
+    except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+        logger.exception("get_users_with_group_info_resource: failed")
+        return _err(f"Failed to fetch users with group info: {e}")
+
+
+async def get_regions_resource():
+    """Return the list of available VPN regions."""
+    logger.debug("get_regions_resource: fetching regions")
+    try:
+        # The shared client is pooled; it must not be closed here.
+        client = await user_tools.get_async_client()
+        response = await client.get("/api/v1/regions")
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        logger.exception("get_regions_resource: failed to fetch regions")
+        return _err(f"Failed to fetch regions: {e}")
+
+
+# Selection info cached against the selection's version counter: agents
+# poll this resource, and while nothing changed the handler returns the
+# same dict without rebuilding anything.
+_SELECTION_VIEW = (None, None)
+
+
+async def get_current_selection_data():
+    """Return information about the currently selected object."""
+    global _SELECTION_VIEW
+    version = CURRENT_SELECTED_OBJECT._version
+    if _SELECTION_VIEW[0] != version:
+        _SELECTION_VIEW = (version, CURRENT_SELECTED_OBJECT.get_selected_object_info())
+    return _SELECTION_VIEW[1]
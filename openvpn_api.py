@@ -0,0 +1,68 @@
+"""Thin synchronous client for the CloudConnexa REST API."""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("connexa.openvpn_api")
+
+API_BASE_URL = os.getenv("CONNEXA_API_URL", "https://api.openvpn.com")
+
+_TOKEN: Optional[str] = None
+_TOKEN_EXPIRES_AT: float = 0.0
+
+
+def _get_token() -> str:
+    """Fetch (and cache) an OAuth bearer token for the API."""
+    global _TOKEN, _TOKEN_EXPIRES_AT
+    if _TOKEN and time.monotonic() < _TOKEN_EXPIRES_AT - 60:
+        return _TOKEN
+    client_id = os.environ["CONNEXA_CLIENT_ID"]
+    client_secret = os.environ["CONNEXA_CLIENT_SECRET"]
+    response = httpx.post(
+        f"{API_BASE_URL}/api/v1/oauth/token",
+        data={"grant_type": "client_credentials"},
+        auth=(client_id, client_secret),
+        timeout=30.0,
+    )
+    response.raise_for_status()
+    body = response.json()
+    _TOKEN = body["access_token"]
+    _TOKEN_EXPIRES_AT = time.monotonic() + float(body.get("expires_in", 3600))
+    return _TOKEN
+
+
+def fresh_token() -> Optional[str]:
+    """Return the cached token if it is not near expiry, else None."""
+    if _TOKEN and time.monotonic() < _TOKEN_EXPIRES_AT - 60:
+        return _TOKEN
+    return None
+
+
+def auth_headers() -> Dict[str, str]:
+    return {"Authorization": f"Bearer {_get_token()}"}
+
+
+def call_api(action: str, path: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Perform a blocking API call.
+
+    Returns ``{"status": <http status>, "data": <parsed body>}`` on any
+    completed request, or ``{"status": 0, "error": ...}`` on transport
+    failure.
+    """
+    url = API_BASE_URL + path
+    try:
+        response = httpx.request(
+            action.upper(), url, json=data, headers=auth_headers(), timeout=30.0
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        return {"status": response.status_code, "data": body}
+    except httpx.HTTPError as e:
+        logger.error("call_api: %s %s failed: %s", action.upper(), path, e)
+        return {"status": 0, "error": str(e)}
@@ -0,0 +1,865 @@
+"""Selection state shared across the Connexa MCP tools.
+
+A single ``SelectedObject`` instance tracks which API object (network,
+connector, host, user, ...) the agent is currently working on.  Tools
+select an object by name, act on the selection, and listeners are
+notified whenever the selection changes.
+"""
+
+import functools
+import json
+import logging
+import os
+import pickle
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional
+
+from user_tools import call_api_async
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+logger = logging.getLogger("connexa.selected_object")
+
+SWAGGER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "swagger.json")
+
+# Parsed-swagger sidecar: unpickling a dict tree is several times faster
+# than re-parsing the JSON, so the first process to parse the spec
+# leaves a pickle keyed by the source file's fingerprint for the next.
+_SWAGGER_PKL_PATH = os.path.join(os.path.dirname(SWAGGER_PATH), "swagger.pkl")
+
+_SWAGGER_CONTENT: Optional[Dict[str, Any]] = None
+
+
+def _load_swagger_pickle(fingerprint: tuple) -> Optional[Dict[str, Any]]:
+    """Return the pickled swagger dict if it matches ``fingerprint``."""
+    try:
+        with open(_SWAGGER_PKL_PATH, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("fp") == fingerprint:
+            return cached["data"]
+    except Exception as e:  # missing, stale or corrupt sidecar: reparse
+        logger.debug("Swagger pickle cache unusable: %s", e)
+    return None
+
+
+def _write_swagger_pickle(fingerprint: tuple, data: Dict[str, Any]) -> None:
+    """Best-effort atomic write of the parsed swagger sidecar."""
+    tmp_path = _SWAGGER_PKL_PATH + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"fp": fingerprint, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _SWAGGER_PKL_PATH)
+    except OSError as e:
+        logger.debug("Could not write swagger pickle cache: %s", e)
+
+
+def _loads(text):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps_pretty(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def _get_swagger_content() -> Optional[Dict[str, Any]]:
+    """Load and cache the swagger description shipped next to the server.
+
+    The returned mapping is read-only; consumers share one structure and
+    must not mutate (or defensively deep-copy) it.
+    """
+    global _SWAGGER_CONTENT
+    if _SWAGGER_CONTENT is None:
+        try:
+            st = os.stat(SWAGGER_PATH)
+            fingerprint = (st.st_mtime_ns, st.st_size)
+            data = _load_swagger_pickle(fingerprint)
+            if data is None:
+                with open(SWAGGER_PATH, "rb") as f:
+                    data = _loads(f.read())
+                _write_swagger_pickle(fingerprint, data)
+            _SWAGGER_CONTENT = MappingProxyType(data)
+        except Exception as e:
+            logger.error("Failed to load swagger content from %s: %s", SWAGGER_PATH, e)
+            return None
+    return _SWAGGER_CONTENT
+
+
+# Direct reference to components.schemas, extracted once so schema
+# resolution never re-descends the swagger tree.
+_SCHEMAS_BY_NAME: Optional[Dict[str, Any]] = None
+
+
+def _get_schemas_by_name() -> Optional[Dict[str, Any]]:
+    global _SCHEMAS_BY_NAME
+    if _SCHEMAS_BY_NAME is None:
+        swagger = _get_swagger_content()
+        if swagger and "components" in swagger and "schemas" in swagger["components"]:
+            _SCHEMAS_BY_NAME = swagger["components"]["schemas"]
+    return _SCHEMAS_BY_NAME
+
+
+# (update_name, create_name) per type; only networks distinguish create
+# from update.  The flat per-request-type key table derives from this.
+_SCHEMA_NAME_DISPATCH = {
+    "network": ("NetworkUpdateRequest", "NetworkCreateRequest"),
+    "connector": ("NetworkConnectorRequest", "NetworkConnectorRequest"),
+    "host": ("HostRequest", "HostRequest"),
+    "user": ("UserRequest", "UserRequest"),
+    "user_group": ("UserGroupRequest", "UserGroupRequest"),
+    "dns_record": ("DnsRecordRequest", "DnsRecordRequest"),
+}
+
+_SCHEMA_NAME_BY_KEY = {
+    (object_type, request_type): name
+    for object_type, names in _SCHEMA_NAME_DISPATCH.items()
+    for request_type, name in zip(("update", "create"), names)
+}
+
+# Flattened (object_type, request_type) -> schema view, built once from
+# swagger so repeat lookups skip the branch ladder and dict traversal.
+_SCHEMA_CACHE: Optional[Dict[Any, Dict[str, Any]]] = None
+
+
+def get_schema_for_object_type(object_type: str, request_type: str = "update") -> Optional[Dict[str, Any]]:
+    """Resolve the request-body schema for an object type from swagger."""
+    global _SCHEMA_CACHE
+    if _SCHEMA_CACHE is None:
+        schemas = _get_schemas_by_name()
+        if schemas is None:
+            return None
+        _SCHEMA_CACHE = {
+            key: schemas[name]
+            for key, name in _SCHEMA_NAME_BY_KEY.items()
+            if name in schemas
+        }
+    return _SCHEMA_CACHE.get((object_type, request_type))
+
+
+def get_network_command_definitions() -> List[Dict[str, Any]]:
+    """Commands that only make sense while a network is selected."""
+    return [
+        {
+            "name": "list_connectors_of_selected",
+            "method": "get",
+            "path_template": "/api/v1/networks/{id}/connectors",
+            "description": "List the connectors of the selected network.",
+        },
+        {
+            "name": "create_connector_in_selected",
+            "method": "post",
+            "path_template": "/api/v1/networks/{id}/connectors",
+            "description": "Create a connector inside the selected network.",
+        },
+    ]
+
+
+def get_connector_command_definitions() -> List[Dict[str, Any]]:
+    """Commands that only make sense while a connector is selected."""
+    return [
+        {
+            "name": "get_connector_profile",
+            "method": "get",
+            "path_template": "/api/v1/connectors/{id}/profile",
+            "description": "Download the OpenVPN profile of the selected connector.",
+        },
+        {
+            "name": "regenerate_connector_token",
+            "method": "post",
+            "path_template": "/api/v1/connectors/{id}/token",
+            "description": "Regenerate the deployment token of the selected connector.",
+        },
+    ]
+
+
+# Commands available regardless of selection, plus the per-type paths
+# used for delete/update of the selected object.  Pure constants, built
+# once instead of per get_available_commands call.
+_GLOBAL_CREATE_COMMANDS = (
+    {
+        "name": "create_network",
+        "method": "post",
+        "path_template": "/api/v1/networks",
+        "description": "Create a new network.",
+    },
+    {
+        "name": "create_host",
+        "method": "post",
+        "path_template": "/api/v1/hosts",
+        "description": "Create a new host.",
+    },
+    {
+        "name": "create_user",
+        "method": "post",
+        "path_template": "/api/v1/users",
+        "description": "Create a new user.",
+    },
+    {
+        "name": "create_user_group",
+        "method": "post",
+        "path_template": "/api/v1/user-groups",
+        "description": "Create a new user group.",
+    },
+    {
+        "name": "create_dns_record",
+        "method": "post",
+        "path_template": "/api/v1/dns-records",
+        "description": "Create a new DNS record.",
+    },
+)
+
+_DELETE_PATH_MAP = {
+    "network": "/api/v1/networks/{id}",
+    "connector": "/api/v1/connectors/{id}",
+    "host": "/api/v1/hosts/{id}",
+    "user": "/api/v1/users/{id}",
+    "user_group": "/api/v1/user-groups/{id}",
+    "dns_record": "/api/v1/dns-records/{id}",
+}
+
+# (prefix, suffix) split of each known template around the {id} slot;
+# concatenation beats str.format severalfold on these short strings.
+_PATH_TEMPLATE_PARTS: Dict[str, Any] = {}
+
+
+def _summarize_response(response: Any, limit: int = 512) -> str:
+    """Render an API response for a returned message, capped in size.
+
+    Full responses can run to tens of KB; clients that need the payload
+    get it from the selection details, not the status message.
+    """
+    text = repr(response)
+    if len(text) > limit:
+        return text[:limit] + "...(truncated)"
+    return text
+
+
+def _fill_id(template: str, object_id: Any) -> str:
+    parts = _PATH_TEMPLATE_PARTS.get(template)
+    if parts is None:
+        prefix, sep, suffix = template.partition("{id}")
+        parts = (prefix, suffix) if sep else (template, None)
+        _PATH_TEMPLATE_PARTS[template] = parts
+    prefix, suffix = parts
+    if suffix is None:
+        return prefix
+    return f"{prefix}{object_id}{suffix}"
+
+
+class SelectedObject:
+    """Holds the currently selected API object and notifies listeners."""
+
+    # Slot-backed: attribute access skips the instance __dict__ and a
+    # typo'd assignment fails loudly instead of creating a new attr.
+    __slots__ = (
+        "object_type",
+        "object_id",
+        "object_name",
+        "details",
+        "_listeners",
+        "_listener_set",
+        "_cached_info",
+        "_version",
+        "_commands_cache",
+        "_commands_by_name",
+    )
+
+    def __init__(self) -> None:
+        self.object_type: Optional[str] = None
+        self.object_id: Optional[str] = None
+        self.object_name: Optional[str] = None
+        self.details: Optional[Dict[str, Any]] = None
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+        # Mirror of _listeners for O(1) duplicate checks; the list keeps
+        # notification order.
+        self._listener_set: set = set()
+        # Rebuilt lazily; invalidated on every selection mutation so the
+        # info resource can hand out the same dict while nothing changed.
+        self._cached_info: Optional[Dict[str, Any]] = None
+        # Bumped on every mutation; readers can compare versions instead
+        # of the selection fields to detect change cheaply.
+        self._version = 0
+        # Command list and name -> command dict for the current
+        # selection, built lazily and dropped whenever it changes.
+        self._commands_cache: Optional[List[Dict[str, Any]]] = None
+        self._commands_by_name: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def register_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        if listener not in self._listener_set:
+            self._listener_set.add(listener)
+            self._listeners.append(listener)
+
+    def _notify_listeners(self) -> None:
+        # Bind loop invariants once; skip traceback capture when no
+        # handler would render it anyway.
+        obj_type = self.object_type
+        log_error = logger.error
+        capture_tb = logger.hasHandlers()
+        for listener in self._listeners:
+            try:
+                listener(obj_type)
+            except Exception:
+                log_error("Error notifying listener %r", listener, exc_info=capture_tb)
+
+    def select(
+        self,
+        object_type: str,
+        object_id: Optional[str],
+        object_name: Optional[str],
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.object_type = object_type
+        self.object_id = object_id
+        self.object_name = object_name
+        self.details = details
+        self._cached_info = None
+        self._commands_cache = None
+        self._commands_by_name = None
+        self._version += 1
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Selected %s '%s' (id=%s). Details: %s",
+                object_type,
+                object_name,
+                object_id,
+                _dumps_pretty(details),
+            )
+        self._notify_listeners()
+
+    def refresh_details(self, object_name: Optional[str], details: Optional[Dict[str, Any]]) -> None:
+        """Update the current selection's name and details in place.
+
+        Cheaper than re-running select() after an update: the type and
+        id are unchanged and the pretty-printed details dump is skipped.
+        """
+        self.object_name = object_name
+        self.details = details
+        self._cached_info = None
+        self._commands_cache = None
+        self._commands_by_name = None
+        self._version += 1
+        self._notify_listeners()
+
+    def clear(self) -> None:
+        # Clearing an empty selection changes nothing; skip the version
+        # bump and the listener fan-out entirely.
+        if self.object_type is None:
+            return
+        self.object_type = None
+        self.object_id = None
+        self.object_name = None
+        self.details = None
+        self._cached_info = None
+        self._commands_cache = None
+        self._commands_by_name = None
+        self._version += 1
+        logger.info("Selection cleared.")
+        self._notify_listeners()
+
+    def get_selected_object_info(self) -> Dict[str, Any]:
+        """Return selection info, reusing the last dict while unchanged."""
+        if self._cached_info is None:
+            self._cached_info = {
+                "object_type": self.object_type,
+                "object_id": self.object_id,
+                "object_name": self.object_name,
+                "details": self.details,
+                "selected": self.object_type is not None,
+            }
+        return self._cached_info
+
+    def get_available_commands(self) -> List[Dict[str, Any]]:
+        """Return the commands applicable to the current selection."""
+        if self._commands_cache is not None:
+            return self._commands_cache
+        commands: List[Dict[str, Any]] = list(_GLOBAL_CREATE_COMMANDS)
+        if self.object_type:
+            path_template = _DELETE_PATH_MAP.get(self.object_type)
+            if path_template is not None:
+                commands.append(
+                    {
+                        "name": f"delete_selected_{self.object_type}",
+                        "method": "delete",
+                        "path_template": path_template,
+                        "description": f"Delete the selected {self.object_type}.",
+                    }
+                )
+                commands.append(
+                    {
+                        "name": "update_selected",
+                        "method": "put",
+                        "path_template": path_template,
+                        "description": f"Update the selected {self.object_type} (see complete_update_selected).",
+                    }
+                )
+            if self.object_type == "network":
+                commands.extend(get_network_command_definitions())
+            elif self.object_type == "connector":
+                commands.extend(get_connector_command_definitions())
+        self._commands_cache = commands
+        return commands
+
+
+    def get_command_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """O(1) lookup of an available command by name for this selection."""
+        if self._commands_by_name is None:
+            self._commands_by_name = {
+                cmd["name"]: cmd for cmd in self.get_available_commands()
+            }
+        return self._commands_by_name.get(name)
+
+
+CURRENT_SELECTED_OBJECT = SelectedObject()
+
+# Where and how to look up each selectable type; never depends on the
+# call arguments, so built once at import.
+OBJECT_TYPE_CONFIG = MappingProxyType({
+    "network": {
+        "path": "/api/v1/networks",
+        "parent_type": None,
+        "parent_id_param_name": None,
+        "id_field": "id",
+        "name_field": "name",
+    },
+    "connector": {
+        "path": "/api/v1/networks/{parent_id}/connectors",
+        "parent_type": "network",
+        "parent_id_param_name": "networkId",
+        "id_field": "id",
+        "name_field": "name",
+    },
+    "host": {
+        "path": "/api/v1/hosts",
+        "parent_type": None,
+        "parent_id_param_name": None,
+        "id_field": "id",
+        "name_field": "name",
+    },
+    "user": {
+        "path": "/api/v1/users",
+        "parent_type": None,
+        "parent_id_param_name": None,
+        "id_field": "id",
+        "name_field": "username",
+    },
+    "user_group": {
+        "path": "/api/v1/user-groups",
+        "parent_type": None,
+        "parent_id_param_name": None,
+        "id_field": "id",
+        "name_field": "name",
+    },
+    "dns_record": {
+        "path": "/api/v1/dns-records",
+        "parent_type": None,
+        "parent_id_param_name": None,
+        "id_field": "id",
+        "name_field": "domain",
+    },
+    "region": {
+        "path": "/api/v1/regions",
+        "parent_type": None,
+        "parent_id_param_name": None,
+        "id_field": "id",
+        "name_field": "id",
+        "default_criteria_key": "id",
+    },
+})
+
+_SUPPORTED_TYPES_STR = ", ".join(OBJECT_TYPE_CONFIG)
+
+_DEFAULT_REGION = "us-west-1"
+
+
+def _current_region() -> str:
+    # Still read per call: tests patch the environment between
+    # invocations; only the default string is hoisted.
+    return os.environ.get("CONNEXA_REGION", _DEFAULT_REGION)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_kwargs(raw: str) -> Dict[str, Any]:
+    """Parse a kwargs JSON string into filter criteria.
+
+    Agents tend to resend identical filter strings, so parses are
+    cached on the raw string.  The returned dict is shared between
+    calls and must be treated as read-only.
+    """
+    try:
+        parsed = _loads(raw)
+    except ValueError:
+        logger.warning("select_object_tool: could not parse kwargs JSON: %s", raw)
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _make_selector(obj_type_lower: str, config: Dict[str, Any]) -> Callable[..., Dict[str, Any]]:
+    """Build the per-type selection core with its constants baked in.
+
+    The field names and message templates for a type never change, so
+    each type gets one closure over them instead of re-reading the
+    config (and re-rendering the type name) on every call.
+    """
+    id_field = config["id_field"]
+    name_field = config["name_field"]
+    default_criteria_key = config.get("default_criteria_key")
+    not_found_tmpl = f"No {obj_type_lower} matched '%s'."
+    ambiguous_tmpl = f"%d {obj_type_lower}s matched '%s'; refine the search to select one."
+
+    def _select_from(
+        items_list: List[Dict[str, Any]],
+        name_search: Optional[str],
+        filter_kwargs: Dict[str, Any],
+        connexa_region: str,
+    ) -> Dict[str, Any]:
+        # Lower the search term once; the loop below only lowers the
+        # item side.
+        ns_lower = name_search.lower() if name_search else ""
+        is_default = not name_search or ns_lower == "default"
+
+        # Single pass over the listing: the default candidate (regions
+        # pick the configured region, everything else the first item),
+        # the filter matches and the exact-name match are all collected
+        # in one traversal, each name lowered exactly once.
+        # filter_kwargs is constant across the loop; lower its values
+        # once instead of per (item, key) pair.
+        fk_items = [(k, str(v).lower()) for k, v in filter_kwargs.items()]
+
+        region_default = None
+        exact_match = None
+        if is_default and not filter_kwargs:
+            # Nothing to filter (no search term, or the "default"
+            # keyword): every item matches, so skip the scan entirely;
+            # only the default candidate needs locating.
+            found_objects = items_list
+            if default_criteria_key:
+                region_default = next(
+                    (it for it in items_list if it.get(default_criteria_key) == connexa_region),
+                    None,
+                )
+        elif not fk_items and not is_default:
+            # Name-only search: a single comprehension keeps the prefix
+            # scan inside the interpreter's specialized C loop, the
+            # closest pure-Python analog of a vectorized mask.  The
+            # default candidate is irrelevant on this branch and the
+            # exact-match check only walks the (small) match set.
+            found_objects = [
+                item
+                for item in items_list
+                if str(item.get(name_field, "")).lower().startswith(ns_lower)
+            ]
+            for item in found_objects:
+                if str(item.get(name_field, "")).lower() == ns_lower:
+                    exact_match = item
+                    break
+        else:
+            found_objects = []
+            for item in items_list:
+                # One bound-method lookup per item instead of one per
+                # field access.
+                g = item.get
+                name_raw = g(name_field, "")
+                item_name_str = (name_raw if isinstance(name_raw, str) else str(name_raw)).lower()
+                if is_default or item_name_str.startswith(ns_lower):
+                    match_all_kwargs = True
+                    for key, value_lower in fk_items:
+                        item_value = g(key)
+                        if item_value is None:
+                            match_all_kwargs = False
+                            break
+                        # API values are almost always strings already;
+                        # skip the str() constructor when they are.
+                        if not isinstance(item_value, str):
+                            item_value = str(item_value)
+                        if item_value.lower() != value_lower:
+                            match_all_kwargs = False
+                            break
+                    if match_all_kwargs:
+                        found_objects.append(item)
+                        # The default candidate must satisfy the active
+                        # filters too, so only filter-passing items are
+                        # considered for it.
+                        if (
+                            default_criteria_key
+                            and region_default is None
+                            and g(default_criteria_key) == connexa_region
+                        ):
+                            region_default = item
+                        # An exact name hit decides the selection
+                        # outright; scanning the rest of the listing
+                        # cannot change it.
+                        if not is_default and item_name_str == ns_lower:
+                            exact_match = item
+                            break
+        default_details = region_default
+        if default_details is None:
+            # With filters active the fallback comes from the filtered
+            # matches, not the raw listing, so the selection can never
+            # contradict search_matches.
+            pool = found_objects if filter_kwargs else items_list
+            if pool:
+                default_details = pool[0]
+
+        # The match-name list is only read by the return payloads and
+        # the summary log; build it at most once, on demand.
+        _names: Optional[List[Any]] = None
+
+        def found_names() -> List[Any]:
+            nonlocal _names
+            if _names is None:
+                _names = [obj.get(name_field, "Unnamed") for obj in found_objects]
+            return _names
+
+        def _result(**extra: Any) -> Dict[str, Any]:
+            # Shared shape for every post-listing return path; the
+            # match-name list is still only built on first access.
+            base: Dict[str, Any] = {
+                "object_type": obj_type_lower,
+                "search_matches": found_names(),
+            }
+            base.update(extra)
+            return base
+
+        # One summary record instead of a log line (format + handler
+        # dispatch + I/O) per matching item.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "select_object_tool: %d %s(s) matched: %s",
+                len(found_objects),
+                obj_type_lower,
+                found_names(),
+            )
+
+        selected_item_details = default_details if is_default else exact_match
+        if selected_item_details is None and len(found_objects) == 1:
+            selected_item_details = found_objects[0]
+
+        if selected_item_details is not None:
+            selected_id = selected_item_details.get(id_field)
+            selected_name = selected_item_details.get(name_field)
+            CURRENT_SELECTED_OBJECT.select(
+                obj_type_lower, selected_id, selected_name, selected_item_details
+            )
+            logger.info("select_object_tool: selected %s '%s'", obj_type_lower, selected_name)
+            return _result(
+                status="success",
+                selected_object_id=selected_id,
+                selected_object_name=selected_name,
+            )
+
+        if not found_objects:
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error(
+                    "select_object_tool: no %s matched '%s' with filters %s",
+                    obj_type_lower,
+                    name_search,
+                    _dumps_pretty(filter_kwargs),
+                )
+            return _result(status="not_found", message=not_found_tmpl % (name_search,))
+        return _result(
+            status="ambiguous",
+            message=ambiguous_tmpl % (len(found_objects), name_search),
+        )
+
+    return _select_from
+
+
+# One specialized selection core per supported type, built at import.
+_SELECTORS = {
+    object_type: _make_selector(object_type, config)
+    for object_type, config in OBJECT_TYPE_CONFIG.items()
+}
+
+
+async def select_object_tool(
+    object_type: str,
+    name_search: Optional[str] = None,
+    kwargs: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Find an API object by (prefix) name and select it.
+
+    ``kwargs`` is an optional JSON object of extra field filters, e.g.
+    ``{"vpnRegionId": "us-west-1"}``.
+    """
+    CONNEXA_REGION = _current_region()
+    obj_type_lower = object_type.lower() if object_type else ""
+
+    config = OBJECT_TYPE_CONFIG.get(obj_type_lower)
+    if config is None:
+        CURRENT_SELECTED_OBJECT.clear()
+        return {
+            "status": "error",
+            "object_type": obj_type_lower,
+            "message": (
+                f"Unsupported object type '{object_type}'. "
+                f"Supported types: {_SUPPORTED_TYPES_STR}"
+            ),
+            "search_matches": [],
+        }
+
+    # The per-type field names live in the specialized selector; only
+    # the routing values are needed here.
+    api_path, parent_type, parent_id_param_name = (
+        config["path"],
+        config["parent_type"],
+        config["parent_id_param_name"],
+    )
+
+    if parent_type:
+        if CURRENT_SELECTED_OBJECT.object_type != parent_type:
+            CURRENT_SELECTED_OBJECT.clear()
+            return {
+                "status": "error",
+                "object_type": obj_type_lower,
+                "message": (
+                    f"A {parent_type} must be selected before selecting a "
+                    f"{obj_type_lower} (its {parent_id_param_name} comes from the selection)."
+                ),
+                "search_matches": [],
+            }
+        api_path = api_path.format(parent_id=CURRENT_SELECTED_OBJECT.object_id)
+
+    # Agents routinely pass "" or "{}"; neither is worth a JSON parse.
+    if kwargs and kwargs.strip() not in ("", "{}"):
+        filter_kwargs = _parse_kwargs(kwargs)
+    else:
+        filter_kwargs = {}
+
+    try:
+        logger.info("select_object_tool: listing %ss via %s", obj_type_lower, api_path)
+        response = await call_api_async(action="get", path=api_path)
+        status = response.get("status", 0) if isinstance(response, dict) else 0
+        if status != 200:
+            return {
+                "status": "error",
+                "object_type": obj_type_lower,
+                "message": f"API call to list {obj_type_lower}s failed: {_summarize_response(response)}",
+                "search_matches": [],
+            }
+        data = response.get("data")
+        if isinstance(data, dict):
+            items_list = data.get("content", [])
+        elif isinstance(data, list):
+            items_list = data
+        else:
+            items_list = []
+
+        return _SELECTORS[obj_type_lower](items_list, name_search, filter_kwargs, CONNEXA_REGION)
+    except (KeyError, TypeError, ValueError) as e:
+        # Malformed API payloads land here; they are expected enough
+        # that formatting a full traceback per occurrence is waste.
+        logger.warning("select_object_tool: error selecting %s: %s", obj_type_lower, e)
+        return {
+            "status": "error",
+            "object_type": obj_type_lower,
+            "message": f"Error selecting {obj_type_lower}: {e}",
+            "search_matches": [],
+        }
+    except Exception as e:
+        logger.error("select_object_tool: error selecting %s: %s", obj_type_lower, e, exc_info=True)
+        return {
+            "status": "error",
+            "object_type": obj_type_lower,
+            "message": f"Error selecting {obj_type_lower}: {e}",
+            "search_matches": [],
+        }
+
+
+async def act_on_selected_object(command_name: str, kwargs: Optional[str] = None) -> Dict[str, Any]:
+    """Execute one of the commands reported by ``get_available_commands``."""
+    command = CURRENT_SELECTED_OBJECT.get_command_by_name(command_name)
+    if command is None:
+        available_commands = CURRENT_SELECTED_OBJECT.get_available_commands()
+        return {
+            "status": "error",
+            "message": (
+                f"Unknown command '{command_name}'. "
+                f"Available: {[cmd['name'] for cmd in available_commands]}"
+            ),
+        }
+
+    api_method = command["method"]
+    api_path_template = command["path_template"]
+    payload = None
+    if kwargs:
+        try:
+            payload = _loads(kwargs)
+        except ValueError as e:
+            return {"status": "error", "message": f"Invalid kwargs JSON: {e}"}
+
+    api_path = _fill_id(api_path_template, CURRENT_SELECTED_OBJECT.object_id)
+    try:
+        response = await call_api_async(action=api_method, path=api_path, data=payload)
+        status = response.get("status", 0) if isinstance(response, dict) else 0
+        if 200 <= status < 300:
+            # Command methods are defined lowercase; compare directly.
+            if api_method == "delete":
+                CURRENT_SELECTED_OBJECT.clear()
+            return {
+                "status": "success",
+                "message": (
+                    f"Successfully executed {command_name}. "
+                    f"API Response: {_summarize_response(response)}"
+                ),
+            }
+        return {
+            "status": "error",
+            "message": f"API call failed for {command_name}: {_summarize_response(response)}",
+        }
+    except Exception as e:
+        logger.error("act_on_selected_object: error executing %s: %s", command_name, e, exc_info=True)
+        return {"status": "error", "message": f"Error executing {command_name}: {e}"}
+
+
+async def complete_update_selected(kwargs: str) -> Dict[str, Any]:
+    """Apply a JSON object of field updates to the selected object."""
+    object_type = CURRENT_SELECTED_OBJECT.object_type
+    if object_type is None:
+        return {"status": "error", "message": "Nothing is selected."}
+
+    try:
+        updates = _loads(kwargs)
+    except ValueError as e:
+        return {"status": "error", "message": f"Invalid kwargs JSON: {e}"}
+    if not isinstance(updates, dict):
+        return {"status": "error", "message": "kwargs must be a JSON object."}
+
+    schema = get_schema_for_object_type(object_type, "update")
+    merged = dict(CURRENT_SELECTED_OBJECT.details or {})
+    merged.update(updates)
+    if schema and isinstance(schema.get("properties"), dict):
+        merged = {k: v for k, v in merged.items() if k in schema["properties"]}
+
+    path_template = _DELETE_PATH_MAP.get(object_type)
+    if path_template is None:
+        return {"status": "error", "message": f"Updates are not supported for {object_type}."}
+    api_path = _fill_id(path_template, CURRENT_SELECTED_OBJECT.object_id)
+
+    try:
+        response = await call_api_async(action="put", path=api_path, data=merged)
+        status = response.get("status", 0) if isinstance(response, dict) else 0
+        if 200 <= status < 300:
+            new_details = response.get("data")
+            new_details = new_details if isinstance(new_details, dict) else {}
+            new_name = new_details.get("name", CURRENT_SELECTED_OBJECT.object_name)
+            CURRENT_SELECTED_OBJECT.refresh_details(new_name, new_details)
+            return {
+                "status": "success",
+                "message": (
+                    f"Successfully updated {object_type} '{new_name}'. "
+                    f"Details refreshed. API Response: {_summarize_response(response)}"
+                ),
+            }
+        return {
+            "status": "error",
+            "message": f"Update failed for {object_type}: {_summarize_response(response)}",
+        }
+    except Exception as e:
+        logger.error("complete_update_selected: error updating %s: %s", object_type, e, exc_info=True)
+        return {"status": "error", "message": f"Error updating {object_type}: {e}"}
@@ -0,0 +1,324 @@
+"""User and user-group helpers built on the CloudConnexa API."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from openvpn_api import API_BASE_URL, _get_token, call_api, fresh_token
+
+logger = logging.getLogger("connexa.user_tools")
+
+# The overwhelmingly common first-page request; precomputed so the hot
+# path does not rebuild the same query string on every call.
+_USER_GROUPS_PAGE0 = "/api/v1/user-groups?page=0&size=1000"
+
+
+def get_users(page: int = 0, size: int = 1000) -> Dict[str, Any]:
+    """Blocking helper returning one page of users."""
+    response = call_api(action="get", path=f"/api/v1/users?page={page}&size={size}")
+    if isinstance(response, dict) and response.get("status") == 200:
+        data = response.get("data")
+        if isinstance(data, dict):
+            return data
+    return {"error": f"Failed to fetch users: {response}"}
+
+
+async def get_users_async(page: int = 0, size: int = 1000) -> Dict[str, Any]:
+    """Return one page of users via the shared pooled client.
+
+    Preferred over ``get_users`` in async contexts: no thread hop, no
+    contextvars copy, no cross-thread future signaling.
+    """
+    try:
+        response = await _get_shared_client().get(f"/api/v1/users?page={page}&size={size}")
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        return {"error": f"Failed to fetch users: {e}"}
+
+
+# One pooled client shared by every async helper; created on first use
+# so importing the module never needs credentials.  Keep-alive pooling
+# means repeat calls reuse TCP/TLS state instead of handshaking anew.
+_SHARED_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+# HTTP/2 lets the concurrent fan-outs multiplex one connection instead
+# of queueing behind HTTP/1.1 head-of-line blocking; it needs the
+# optional h2 package (httpx[http2]).
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:  # pragma: no cover - h2 is optional
+    _HTTP2 = False
+
+
+class _TokenAuth(httpx.Auth):
+    """Inject a fresh bearer token into every request.
+
+    The shared client outlives the OAuth token, so the header cannot be
+    captured once at construction; the cached token is reused while
+    fresh and refreshed in a worker thread near expiry so the token
+    endpoint's blocking POST never runs on the event loop.
+    """
+
+    def sync_auth_flow(self, request):
+        request.headers["Authorization"] = f"Bearer {_get_token()}"
+        yield request
+
+    async def async_auth_flow(self, request):
+        token = fresh_token()
+        if token is None:
+            token = await asyncio.to_thread(_get_token)
+        request.headers["Authorization"] = f"Bearer {token}"
+        yield request
+
+
+def _get_shared_client() -> httpx.AsyncClient:
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        _SHARED_CLIENT = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            auth=_TokenAuth(),
+            timeout=30.0,
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _SHARED_CLIENT
+
+
+async def get_async_client() -> httpx.AsyncClient:
+    """Return the shared pooled AsyncClient (do not close it)."""
+    return _get_shared_client()
+
+
+async def call_api_async(action: str, path: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Async counterpart of ``openvpn_api.call_api`` on the pooled client.
+
+    Same envelope: ``{"status": <http status>, "data": <parsed body>}``
+    on any completed request, ``{"status": 0, "error": ...}`` on
+    transport failure.
+    """
+    try:
+        response = await _get_shared_client().request(action.upper(), path, json=data)
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        return {"status": response.status_code, "data": body}
+    except httpx.HTTPError as e:
+        logger.error("call_api_async: %s %s failed: %s", action.upper(), path, e)
+        return {"status": 0, "error": str(e)}
+
+
+async def aclose_shared_client() -> None:
+    """Shutdown hook: close the pooled client if one was created."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is not None:
+        await _SHARED_CLIENT.aclose()
+        _SHARED_CLIENT = None
+
+
+# Concurrent callers asking for the same page share one in-flight task
+# (single-flight) rather than issuing duplicate HTTP requests.
+_INFLIGHT_GROUP_PAGES: Dict[tuple, "asyncio.Task"] = {}
+
+
+async def _fetch_user_groups_page(page: int, size: int) -> Dict[str, Any]:
+    if page == 0 and size == 1000:
+        path = _USER_GROUPS_PAGE0
+    else:
+        path = f"/api/v1/user-groups?page={page}&size={size}"
+    try:
+        response = await _get_shared_client().get(path)
+        response.raise_for_status()
+        # A 2xx from this endpoint is always a JSON object; no need to
+        # re-validate the parsed type on every call.
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        return {"error": f"Failed to fetch user groups: {e}"}
+
+
+async def get_user_groups(page: int = 0, size: int = 1000) -> Dict[str, Any]:
+    """Return one page of user groups."""
+    key = (page, size)
+    task = _INFLIGHT_GROUP_PAGES.get(key)
+    if task is not None:
+        return await task
+    task = asyncio.ensure_future(_fetch_user_groups_page(page, size))
+    _INFLIGHT_GROUP_PAGES[key] = task
+    try:
+        return await task
+    finally:
+        _INFLIGHT_GROUP_PAGES.pop(key, None)
+
+
+async def iter_user_groups(size: int = 1000):
+    """Yield every user group across all pages.
+
+    Page 0 is fetched first to learn totalPages; the remaining pages are
+    then requested concurrently while earlier results stream out.
+    """
+    first = await get_user_groups(page=0, size=size)
+    if "error" in first:
+        # A failed fetch must not look like an empty tenant; raise so
+        # callers surface their own error envelope.
+        raise ValueError(first["error"])
+    for group in first.get("content", []):
+        yield group
+    total_pages = first.get("totalPages") or 1
+    if total_pages > 1:
+        pages = await asyncio.gather(
+            *(get_user_groups(page=p, size=size) for p in range(1, total_pages))
+        )
+        for page_data in pages:
+            # Same rule as page 0: a failed page must not silently
+            # truncate the stream.
+            if "error" in page_data:
+                raise ValueError(page_data["error"])
+            for group in page_data.get("content", []):
+                yield group
+
+
+# Group metadata changes rarely; cache lookups for a short TTL and let
+# concurrent misses for the same id share one in-flight request via a
+# Future placeholder (single-flight).
+_GROUP_CACHE: Dict[str, Any] = {}
+_GROUP_TTL = 60.0
+
+
+# Group names change even more rarely than the rest of the group record,
+# so the id -> name resolution used by the user listings gets a longer
+# TTL layered over the object cache.
+_GROUP_NAME_CACHE: Dict[str, Any] = {}
+_GROUP_NAME_TTL = 300.0
+
+
+def invalidate_user_group(group_id: Optional[str] = None) -> None:
+    """Drop cached group data; call after group create/update/delete."""
+    if group_id is None:
+        _GROUP_CACHE.clear()
+        _GROUP_NAME_CACHE.clear()
+    else:
+        _GROUP_CACHE.pop(group_id, None)
+        _GROUP_NAME_CACHE.pop(group_id, None)
+
+
+_WARM_INTERVAL = 300.0
+
+
+async def _warm_group_cache() -> None:
+    """Prime the id -> name cache from one bulk group listing."""
+    data = await get_user_groups(page=0, size=1000)
+    now = time.monotonic()
+    for group in data.get("content", []):
+        gid = group.get("id")
+        name = group.get("name")
+        if gid and name:
+            _GROUP_NAME_CACHE[gid] = (now, name)
+
+
+async def _periodic_group_refresh() -> None:
+    while True:
+        # Fetch failures surface as an error dict with no content, which
+        # makes the warm pass a no-op until the next interval.  Anything
+        # else (e.g. missing credentials) must not kill the warmer for
+        # the rest of the process, so guard every tick.
+        try:
+            await _warm_group_cache()
+        except Exception as e:
+            logger.warning("group cache refresh failed: %s", e)
+        await asyncio.sleep(_WARM_INTERVAL)
+
+
+def start_group_cache_refresh() -> "asyncio.Task":
+    """Start the background warmer; the first call also primes the cache."""
+    return asyncio.create_task(_periodic_group_refresh())
+
+
+async def resolve_group_names(group_ids) -> Dict[str, str]:
+    """Resolve many group ids to names with at most one listing call.
+
+    Cached ids answer immediately; any miss triggers a single bulk
+    warm pass instead of one GET per id (the classic N+1), with per-id
+    fetches kept only for ids the listing did not cover.
+    """
+    now = time.monotonic()
+    names: Dict[str, str] = {}
+    missing = []
+    for gid in group_ids:
+        entry = _GROUP_NAME_CACHE.get(gid)
+        if entry is not None and now - entry[0] < _GROUP_NAME_TTL:
+            names[gid] = entry[1]
+        else:
+            missing.append(gid)
+    if missing:
+        await _warm_group_cache()
+        still_missing = []
+        for gid in missing:
+            entry = _GROUP_NAME_CACHE.get(gid)
+            if entry is not None:
+                names[gid] = entry[1]
+            else:
+                still_missing.append(gid)
+        if still_missing:
+            resolved = await asyncio.gather(
+                *(get_user_group_name(gid) for gid in still_missing),
+                return_exceptions=True,
+            )
+            for gid, name in zip(still_missing, resolved):
+                if isinstance(name, str):
+                    names[gid] = name
+    return names
+
+
+async def get_user_group_name(group_id: str) -> Optional[str]:
+    """Resolve a group id to its name, caching hits for five minutes."""
+    entry = _GROUP_NAME_CACHE.get(group_id)
+    if entry is not None and time.monotonic() - entry[0] < _GROUP_NAME_TTL:
+        return entry[1]
+    data = await get_user_group(group_id)
+    name = data.get("name") if isinstance(data, dict) else None
+    if name:
+        _GROUP_NAME_CACHE[group_id] = (time.monotonic(), name)
+    return name
+
+
+async def _fetch_user_group(group_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        response = await _get_shared_client().get(f"/api/v1/user-groups/{group_id}")
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+async def get_user_group(group_id: str) -> Optional[Dict[str, Any]]:
+    """Return a single user group by id, or None when unavailable."""
+    entry = _GROUP_CACHE.get(group_id)
+    if entry is not None:
+        if isinstance(entry, asyncio.Future):
+            return await entry
+        ts, data = entry
+        if time.monotonic() - ts < _GROUP_TTL:
+            return data
+    future = asyncio.get_running_loop().create_future()
+    _GROUP_CACHE[group_id] = future
+    try:
+        data = await _fetch_user_group(group_id)
+    except BaseException as e:
+        _GROUP_CACHE.pop(group_id, None)
+        future.set_exception(e)
+        future.exception()  # consume so an unawaited future does not warn
+        raise
+    if data is not None:
+        _GROUP_CACHE[group_id] = (time.monotonic(), data)
+    else:
+        # Do not cache failures; the next caller retries.
+        _GROUP_CACHE.pop(group_id, None)
+    future.set_result(data)
+    return data